@@ -25,7 +25,7 @@ def autodoc(code_path, output_path, config=None):
             raise FileNotFoundError(f"The specified path does not exist: {code_path}")
         
         logger.info(f"Analyzing code at {code_path}")
-        analyzed_code = analyze_code(code_path)
+        analyzed_code = analyze_code(code_path, config)
         
         logger.info("Generating documentation")
         documentation = generate_documentation(analyzed_code, config)
@@ -1,87 +1,288 @@
 import ast
 import os
+import sys
+import json
+import hashlib
 import logging
 import importlib.util
 import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import radon
 from radon.complexity import cc_visit
 from radon.metrics import h_visit
 import math
+from functools import lru_cache
+from collections import deque
+from itertools import repeat
 
 logger = logging.getLogger(__name__)
 
-try:
-    from nltk.corpus import wordnet
-    WORDNET_AVAILABLE = True
-except LookupError:
-    logger.warning("NLTK wordnet data not found. Running without enhanced name inference.")
-    WORDNET_AVAILABLE = False
-except ImportError:
-    logger.warning("NLTK not installed. Running without enhanced name inference.")
-    WORDNET_AVAILABLE = False
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'autodoc')
+# Bump whenever the shape of CodeAnalyzer.result changes so stale entries are ignored
+CACHE_VERSION = '5'
+# Complexity figures come from radon, so a radon upgrade must also miss the cache
+CACHE_PREFIX = f"{CACHE_VERSION}:radon-{radon.__version__}"
 
-def analyze_code(code_path):
+# What a leading identifier word says the class or function does
+_PURPOSE = {
+    'get': 'retrieves',
+    'fetch': 'retrieves',
+    'load': 'loads',
+    'read': 'reads',
+    'set': 'sets',
+    'update': 'updates',
+    'is': 'checks whether',
+    'has': 'checks whether it has',
+    'can': 'checks whether it can',
+    'calc': 'calculates',
+    'calculate': 'calculates',
+    'compute': 'computes',
+    'build': 'builds',
+    'create': 'creates',
+    'make': 'makes',
+    'generate': 'generates',
+    'init': 'initializes',
+    'parse': 'parses',
+    'process': 'processes',
+    'analyze': 'analyzes',
+    'validate': 'validates',
+    'find': 'finds',
+    'save': 'saves',
+    'write': 'writes',
+    'add': 'adds',
+    'remove': 'removes',
+    'delete': 'deletes',
+    'convert': 'converts',
+    'to': 'converts to',
+    'format': 'formats',
+    'render': 'renders',
+    'handle': 'handles',
+    'run': 'runs',
+}
+
+_CAMEL_RE = re.compile(r'[A-Z]?[a-z]+|[A-Z]+(?=[A-Z][a-z]|\d|\W|$)|\d+')
+
+@lru_cache(maxsize=4096)
+def _split_name(name):
+    return tuple(_CAMEL_RE.findall(name))
+
+@lru_cache(maxsize=None)
+def _load_wordnet():
+    try:
+        from nltk.corpus import wordnet
+        wordnet.ensure_loaded()
+        return wordnet
+    except LookupError:
+        logger.warning("NLTK wordnet data not found. Running without enhanced name inference.")
+    except ImportError:
+        logger.warning("NLTK not installed. Running without enhanced name inference.")
+    return None
+
+@lru_cache(maxsize=8192)
+def _word_definition(word):
+    synsets = _load_wordnet().synsets(word.lower())
+    return synsets[0].definition() if synsets else None
+
+def analyze_code(code_path, config=None):
     """
     Analyze the given code and extract relevant information.
     
     Args:
     code_path (str): Path to the code file or directory
+    config (dict, optional): Configuration options; 'cache' (default True) enables
+        the on-disk analysis cache, 'infer_descriptions' (default True) controls
+        whether descriptions are inferred for undocumented code, 'nlp'
+        (default False) uses NLTK WordNet definitions when inferring purposes and
+        'workers' (default None, serial) sets the number of worker processes used
+        for directories. Callers that set 'workers' need an
+        `if __name__ == '__main__':` guard on platforms that spawn processes.
     
     Returns:
     dict: Analyzed code structure
     """
+    config = config or {}
+    use_cache = config.get('cache', True)
+    infer_descriptions = config.get('infer_descriptions', True)
+    use_nlp = config.get('nlp', False)
+    workers = config.get('workers')
     if os.path.isfile(code_path):
-        return {code_path: analyze_file(code_path)}
+        return {code_path: analyze_file(code_path, use_cache=use_cache, infer_descriptions=infer_descriptions, use_nlp=use_nlp)}
     elif os.path.isdir(code_path):
-        return analyze_directory(code_path)
+        return analyze_directory(code_path, use_cache=use_cache, infer_descriptions=infer_descriptions, use_nlp=use_nlp, workers=workers)
     else:
         raise ValueError(f"Invalid path: {code_path}")
 
-def analyze_file(file_path):
-    with open(file_path, 'r', encoding='utf-8') as file:
-        content = file.read()
+def analyze_file(file_path, content=None, use_cache=True, infer_descriptions=True, use_nlp=False):
+    if content is None:
+        content = read_file(file_path)
+    # Key the cache on whether WordNet is actually used, not just requested
+    use_nlp = use_nlp and _load_wordnet() is not None
+    
+    cache_path = get_cache_path(content, infer_descriptions, use_nlp) if use_cache else None
+    if cache_path:
+        cached = load_cached_result(cache_path)
+        if cached is not None:
+            cached['_source'] = content
+            return cached
     
     try:
         tree = ast.parse(content)
-        analyzer = CodeAnalyzer(file_path)
+        analyzer = CodeAnalyzer(file_path, content, infer_descriptions, use_nlp)
         analyzer.visit(tree)
-        return analyzer.result
     except SyntaxError as e:
         logger.error(f"Syntax error in file {file_path}: {str(e)}")
-        return {"error": str(e)}
+        return {"error": str(e), '_source': content}
+    
+    if cache_path:
+        # The source is the cache key's input, so there is no need to store it again
+        store_cached_result(cache_path, {k: v for k, v in analyzer.result.items() if k != '_source'})
+    return analyzer.result
+
+def get_cache_path(content, infer_descriptions=True, use_nlp=False):
+    key = hashlib.blake2b(f"{CACHE_PREFIX}:{int(infer_descriptions)}{int(use_nlp)}:{content}".encode('utf-8'), digest_size=16).hexdigest()
+    return os.path.join(CACHE_DIR, f"{key}.json")
+
+def load_cached_result(cache_path):
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+def store_cached_result(cache_path, result):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(result, file)
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError) as e:
+        logger.warning(f"Could not write analysis cache {cache_path}: {str(e)}")
+
+def read_file(file_path):
+    with open(file_path, 'r', encoding='utf-8') as file:
+        return file.read()
+
+def read_files(file_paths):
+    """
+    Read many source files concurrently so their I/O overlaps.
+    
+    Args:
+    file_paths (list): Paths of the files to read
+    
+    Returns:
+    list: File contents, in the same order as file_paths
+    """
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        return list(executor.map(read_file, file_paths))
+
+def find_python_files(dir_path):
+    """
+    Yield the paths of .py files under dir_path, top-down like os.walk.
+    
+    Uses os.scandir so entry types come from the directory listing rather
+    than a separate stat() call per entry.
+    """
+    stack = [dir_path]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                entries = list(entries)
+        except OSError:
+            continue
+        subdirs = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            elif entry.name.endswith('.py') and entry.is_file():
+                yield entry.path
+        stack.extend(reversed(subdirs))
+
+# Below this many files the process pool start-up costs more than it saves
+PARALLEL_THRESHOLD = 4
+
+def use_process_pool(workers, count):
+    return bool(workers) and workers > 1 and count >= PARALLEL_THRESHOLD
 
-def analyze_directory(dir_path):
+def analyze_directory(dir_path, use_cache=True, infer_descriptions=True, use_nlp=False, workers=None):
+    file_paths = list(find_python_files(dir_path))
+    
+    contents = read_files(file_paths)
+    
+    if use_process_pool(workers, len(file_paths)):
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(analyze_file, file_paths, contents, repeat(use_cache), repeat(infer_descriptions), repeat(use_nlp), chunksize=8)
+                return dict(zip(file_paths, results))
+        except BrokenProcessPool as e:
+            logger.warning(f"Process pool failed, analyzing files serially: {str(e)}")
+    
     result = {}
-    for root, _, files in os.walk(dir_path):
-        for file in files:
-            if file.endswith('.py'):
-                file_path = os.path.join(root, file)
-                result[file_path] = analyze_file(file_path)
+    for file_path, content in zip(file_paths, contents):
+        result[file_path] = analyze_file(file_path, content, use_cache, infer_descriptions, use_nlp)
     return result
 
-class CodeAnalyzer(ast.NodeVisitor):
-    def __init__(self, file_path):
+class CodeAnalyzer:
+    def __init__(self, file_path, source, infer_descriptions=True, use_nlp=False):
         self.file_path = file_path
+        self.source = source
+        # When disabled, no descriptions are inferred and radon is never run
+        self.infer_descriptions = infer_descriptions
+        self.use_nlp = use_nlp
         self.result = {
             'imports': [],
             'classes': {},
             'functions': {},
             'global_variables': [],
             'module_docstring': None,
-            'inferred_description': ''
+            'inferred_description': '',
+            '_source': source
         }
         self.current_class = None
         self.current_function = None
+        self._complexity = None
+        # Counts gathered during the single visitor pass; the innermost scope is last
+        self._module_counts = {'type': 'module', 'body': set(), 'classes': [], 'functions': [], 'imports': 0, 'global_variables': 0}
+        self._scopes = [self._module_counts]
+        # Call sets of the enclosing functions, filled in by visit_Call
+        self._function_calls = []
+    
+    def visit(self, tree):
+        # Iterative pre-order traversal. A handler may return a callback, which
+        # runs once the node's whole subtree has been visited.
+        stack = deque([tree])
+        while stack:
+            node = stack.pop()
+            if not isinstance(node, ast.AST):
+                node()
+                continue
+            handler = self._DISPATCH.get(type(node))
+            if handler:
+                on_exit = handler(self, node)
+                if on_exit:
+                    stack.append(on_exit)
+            stack.extend(reversed(list(ast.iter_child_nodes(node))))
     
     def visit_Module(self, node):
         self.result['module_docstring'] = ast.get_docstring(node)
-        self.result['inferred_description'] = self.infer_module_description(node)
-        self.generic_visit(node)
+        self._module_counts['body'] = {id(n) for n in node.body}
+        
+        if not self.infer_descriptions:
+            return None
+        
+        def on_exit():
+            self.result['inferred_description'] = self.infer_module_description()
+        return on_exit
     
     def visit_Import(self, node):
+        self.count_import(node)
         for alias in node.names:
             self.result['imports'].append(alias.name)
     
     def visit_ImportFrom(self, node):
+        self.count_import(node)
         for alias in node.names:
             self.result['imports'].append(f"{node.module}.{alias.name}")
     
@@ -93,12 +294,20 @@ class CodeAnalyzer(ast.NodeVisitor):
             'base_classes': [self.get_base_class_name(base) for base in node.bases],
             'inferred_description': ''
         }
-        if not class_info['docstring']:
-            class_info['inferred_description'] = self.infer_class_description(node)
+        if self.in_scope_body(node, 'module'):
+            self._module_counts['classes'].append(node.name)
         self.current_class = node.name
         self.result['classes'][node.name] = class_info
-        self.generic_visit(node)
-        self.current_class = None
+        
+        scope = {'type': 'class', 'body': {id(n) for n in node.body}, 'methods': [], 'attributes': 0}
+        self._scopes.append(scope)
+        
+        def on_exit():
+            self._scopes.pop()
+            if self.infer_descriptions and not class_info['docstring']:
+                class_info['inferred_description'] = self.infer_class_description(node, scope)
+            self.current_class = None
+        return on_exit
     
     def visit_FunctionDef(self, node):
         func_info = {
@@ -108,16 +317,28 @@ class CodeAnalyzer(ast.NodeVisitor):
             'decorators': [self.get_decorator_name(d) for d in node.decorator_list],
             'inferred_description': ''
         }
-        if not func_info['docstring']:
-            func_info['inferred_description'] = self.infer_function_description(node)
         if self.current_class:
             self.result['classes'][self.current_class]['methods'][node.name] = func_info
         else:
             self.result['functions'][node.name] = func_info
         
+        if self.in_scope_body(node, 'module'):
+            self._module_counts['functions'].append(node.name)
+        elif self.in_scope_body(node, 'class'):
+            self._scopes[-1]['methods'].append(node.name)
+        
+        scope = {'type': 'function', 'calls': set()}
+        self._scopes.append(scope)
+        self._function_calls.append(scope['calls'])
         self.current_function = node.name
-        self.generic_visit(node)
-        self.current_function = None
+        
+        def on_exit():
+            self.current_function = None
+            self._scopes.pop()
+            self._function_calls.pop()
+            if self.infer_descriptions and not func_info['docstring']:
+                func_info['inferred_description'] = self.infer_function_description(node, scope)
+        return on_exit
     
     def visit_Assign(self, node):
         if isinstance(node.targets[0], ast.Name):
@@ -125,6 +346,42 @@ class CodeAnalyzer(ast.NodeVisitor):
                 self.result['classes'][self.current_class]['class_variables'].append(node.targets[0].id)
             else:
                 self.result['global_variables'].append(node.targets[0].id)
+            
+            if self.in_scope_body(node, 'module'):
+                self._module_counts['global_variables'] += 1
+            elif self.in_scope_body(node, 'class'):
+                self._scopes[-1]['attributes'] += 1
+    
+    def visit_Call(self, node):
+        if not self.infer_descriptions or not self._function_calls:
+            return
+        if isinstance(node.func, ast.Name):
+            call = f"calls {node.func.id}"
+        elif isinstance(node.func, ast.Attribute):
+            call = f"uses {node.func.attr}"
+        else:
+            return
+        # A call also belongs to every function enclosing the innermost one
+        for calls in self._function_calls:
+            calls.add(call)
+    
+    _DISPATCH = {
+        ast.Module: visit_Module,
+        ast.Import: visit_Import,
+        ast.ImportFrom: visit_ImportFrom,
+        ast.ClassDef: visit_ClassDef,
+        ast.FunctionDef: visit_FunctionDef,
+        ast.Assign: visit_Assign,
+        ast.Call: visit_Call,
+    }
+    
+    def count_import(self, node):
+        if self.in_scope_body(node, 'module'):
+            self._module_counts['imports'] += 1
+    
+    def in_scope_body(self, node, scope_type):
+        scope = self._scopes[-1]
+        return scope['type'] == scope_type and id(node) in scope['body']
     
     def get_function_args(self, node):
         args = []
@@ -147,77 +404,68 @@ class CodeAnalyzer(ast.NodeVisitor):
     def get_annotation(self, annotation):
         if annotation is None:
             return None
-        elif isinstance(annotation, ast.Name):
-            return annotation.id
-        elif isinstance(annotation, ast.Attribute):
-            return f'{self.get_annotation(annotation.value)}.{annotation.attr}'
-        elif isinstance(annotation, ast.Subscript):
-            value = self.get_annotation(annotation.value)
-            if isinstance(annotation.slice, ast.Index):
-                slice_value = self.get_annotation(annotation.slice.value)
-            else:
-                slice_value = self.get_annotation(annotation.slice)
-            return f'{value}[{slice_value}]'
-        elif isinstance(annotation, ast.Constant):
-            return repr(annotation.value)
-        elif isinstance(annotation, ast.List):
-            elements = [self.get_annotation(elt) for elt in annotation.elts]
-            return f'[{", ".join(elements)}]'
-        elif isinstance(annotation, ast.Tuple):
-            elements = [self.get_annotation(elt) for elt in annotation.elts]
-            return f'({", ".join(elements)})'
-        else:
-            return str(annotation)
+        handler = self._ANNOTATION_HANDLERS.get(type(annotation))
+        return handler(self, annotation) if handler else str(annotation)
+    
+    _ANNOTATION_HANDLERS = {
+        ast.Name: lambda self, n: n.id,
+        ast.Attribute: lambda self, n: f'{self.get_annotation(n.value)}.{n.attr}',
+        ast.Subscript: lambda self, n: f'{self.get_annotation(n.value)}[{self.get_annotation(n.slice)}]',
+        ast.Constant: lambda self, n: repr(n.value),
+        ast.List: lambda self, n: f'[{", ".join(self.get_annotation(elt) for elt in n.elts)}]',
+        ast.Tuple: lambda self, n: f'({", ".join(self.get_annotation(elt) for elt in n.elts)})',
+    }
+    if sys.version_info < (3, 9):
+        # Subscript slices are wrapped in ast.Index before Python 3.9
+        _ANNOTATION_HANDLERS[ast.Index] = lambda self, n: self.get_annotation(n.value)
     
     def get_decorator_name(self, decorator):
-        if isinstance(decorator, ast.Name):
-            return decorator.id
-        elif isinstance(decorator, ast.Attribute):
-            return f'{decorator.value.id}.{decorator.attr}'
-        return str(decorator)
+        handler = self._NAME_HANDLERS.get(type(decorator))
+        return handler(decorator) if handler else str(decorator)
     
     def get_base_class_name(self, base):
-        if isinstance(base, ast.Name):
-            return base.id
-        elif isinstance(base, ast.Attribute):
-            return f'{base.value.id}.{base.attr}'
-        return str(base)
+        handler = self._NAME_HANDLERS.get(type(base))
+        return handler(base) if handler else str(base)
     
-    def infer_module_description(self, node):
-        classes = [n for n in node.body if isinstance(n, ast.ClassDef)]
-        functions = [n for n in node.body if isinstance(n, ast.FunctionDef)]
-        imports = [n for n in node.body if isinstance(n, (ast.Import, ast.ImportFrom))]
-        global_vars = [n for n in node.body if isinstance(n, ast.Assign) and isinstance(n.targets[0], ast.Name)]
+    _NAME_HANDLERS = {
+        ast.Name: lambda n: n.id,
+        ast.Attribute: lambda n: f'{n.value.id}.{n.attr}',
+    }
+    
+    def infer_module_description(self):
+        counts = self._module_counts
+        classes = counts['classes']
+        functions = counts['functions']
         
-        description = f"This module contains:\n"
+        # Written as Markdown so the renderer can convert it in one call
+        description = f"#### This module contains:\n"
         description += f"- {len(classes)} classe(s)\n"
         description += f"- {len(functions)} function(s)\n"
-        description += f"- {len(imports)} import statement(s)\n"
-        description += f"- {len(global_vars)} global variable(s)\n"
+        description += f"- {counts['imports']} import statement(s)\n"
+        description += f"- {counts['global_variables']} global variable(s)\n"
         
         if classes:
-            description += "\nClasses:\n"
+            description += "\n#### Classes:\n"
             for cls in classes:
-                description += f"- {cls.name}\n"
+                description += f"- {cls}\n"
         
         if functions:
-            description += "\nFunctions:\n"
+            description += "\n#### Functions:\n"
             for func in functions:
-                description += f"- {func.name}\n"
+                description += f"- {func}\n"
         
         # Add complexity analysis
-        complexity = self.analyze_complexity(node)
-        description += f"\nCode Complexity:\n"
+        complexity = self.analyze_complexity()
+        description += f"\n#### Code Complexity:\n"
         description += f"- Cyclomatic Complexity: {complexity['cyclomatic']}\n"
         description += f"- Maintainability Index: {complexity['maintainability']}\n"
         
         return description
     
-    def infer_class_description(self, node):
-        methods = [n for n in node.body if isinstance(n, ast.FunctionDef)]
-        attributes = [n for n in node.body if isinstance(n, ast.Assign) and isinstance(n.targets[0], ast.Name)]
+    def infer_class_description(self, node, scope):
+        methods = scope['methods']
         
-        description = f"This class has {len(methods)} methods and {len(attributes)} attributes.\n"
+        description = f"This class has {len(methods)} methods and {scope['attributes']} attributes.\n"
         
         # Infer class purpose
         class_name = node.name
@@ -226,14 +474,13 @@ class CodeAnalyzer(ast.NodeVisitor):
             description += f"Purpose: {purpose}\n"
         
         # Analyze method names to infer class functionality
-        method_names = [m.name for m in methods]
-        functionality = self.infer_functionality_from_methods(method_names)
+        functionality = self.infer_functionality_from_methods(methods)
         if functionality:
             description += f"Functionality: {functionality}\n"
         
         return description
 
-    def infer_function_description(self, node):
+    def infer_function_description(self, node, scope):
         args = [arg.arg for arg in node.args.args]
         returns = "a value" if node.returns else "None"
         
@@ -246,23 +493,23 @@ class CodeAnalyzer(ast.NodeVisitor):
             description += f"Purpose: {purpose}\n"
         
         # Analyze function body to infer functionality
-        functionality = self.infer_functionality_from_body(node)
+        functionality = self.infer_functionality_from_body(scope['calls'])
         if functionality:
             description += f"Functionality: {functionality}\n"
         
         return description
 
     def infer_purpose_from_name(self, name):
-        words = re.findall(r'[A-Z]?[a-z]+|[A-Z]+(?=[A-Z][a-z]|\d|\W|$)|\d+', name)
-        purpose = []
-        if WORDNET_AVAILABLE:
-            for word in words:
-                synsets = wordnet.synsets(word.lower())
-                if synsets:
-                    purpose.append(synsets[0].definition())
-        else:
-            purpose = words  # Fallback to just using the words themselves
-        return ' '.join(purpose) if purpose else None
+        words = _split_name(name)
+        if self.use_nlp:
+            purpose = [d for d in map(_word_definition, words) if d]
+            return ' '.join(purpose) if purpose else None
+        if not words:
+            return None
+        verb = _PURPOSE.get(words[0].lower())
+        if verb:
+            words = (verb,) + words[1:]
+        return ' '.join(words)
 
     def infer_functionality_from_methods(self, method_names):
         functionality = set()
@@ -277,20 +524,17 @@ class CodeAnalyzer(ast.NodeVisitor):
                 functionality.add('performs calculations')
         return ', '.join(functionality) if functionality else None
 
-    def infer_functionality_from_body(self, node):
-        functionality = set()
-        for n in ast.walk(node):
-            if isinstance(n, ast.Call):
-                if isinstance(n.func, ast.Name):
-                    functionality.add(f"calls {n.func.id}")
-                elif isinstance(n.func, ast.Attribute):
-                    functionality.add(f"uses {n.func.attr}")
-        return ', '.join(functionality) if functionality else None
+    def infer_functionality_from_body(self, calls):
+        return ', '.join(calls) if calls else None
 
-    def analyze_complexity(self, node):
-        code = ast.unparse(node)
-        complexity = cc_visit(code)
-        halstead = h_visit(code)
+    def analyze_complexity(self):
+        if self._complexity is not None:
+            return self._complexity
+        
+        # radon parses source strings itself, so hand it the original text
+        # rather than unparsing the tree we already have
+        complexity = cc_visit(self.source)
+        halstead = h_visit(self.source)
         
         cyclomatic = sum(c.complexity for c in complexity)
         
@@ -301,7 +545,8 @@ class CodeAnalyzer(ast.NodeVisitor):
         else:
             maintainability = 0
         
-        return {
+        self._complexity = {
             'cyclomatic': cyclomatic,
             'maintainability': maintainability
-        }
\ No newline at end of file
+        }
+        return self._complexity
@@ -1,5 +1,4 @@
 import logging
-import re
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +17,7 @@ def generate_documentation(analyzed_code, config=None):
     
     for file_path, file_info in analyzed_code.items():
         if isinstance(file_info, dict) and 'error' in file_info:
-            documentation[file_path] = {'error': file_info['error']}
+            documentation[file_path] = {'error': file_info['error'], 'source': file_info.get('_source', '')}
         elif isinstance(file_info, dict):
             documentation[file_path] = {
                 'module_docstring': file_info.get('module_docstring', ''),
@@ -26,7 +25,8 @@ def generate_documentation(analyzed_code, config=None):
                 'imports': generate_imports_doc(file_info.get('imports', [])),
                 'classes': file_info.get('classes', {}),  # Keep as a dictionary
                 'functions': file_info.get('functions', {}),  # Keep as a dictionary
-                'global_variables': generate_global_variables_doc(file_info.get('global_variables', []))
+                'global_variables': generate_global_variables_doc(file_info.get('global_variables', [])),
+                'source': file_info.get('_source', '')
             }
         else:
             documentation[file_path] = {'error': f"Unexpected file_info type: {type(file_info)}"}
@@ -37,52 +37,47 @@ def generate_imports_doc(imports):
     return "\n".join([f"import {imp}" for imp in imports])
 
 def generate_classes_doc(classes):
-    doc = ""
+    parts = []
     for class_name, class_info in classes.items():
-        doc += f"class {class_name}"
+        parts.append(f"class {class_name}")
         if class_info['base_classes']:
-            doc += f"({', '.join(class_info['base_classes'])})"
-        doc += ":\n"
+            parts.append(f"({', '.join(class_info['base_classes'])})")
+        parts.append(":\n")
         if class_info['docstring']:
-            doc += f"    \"\"\"{class_info['docstring']}\"\"\"\n\n"
+            parts.append(f"    \"\"\"{class_info['docstring']}\"\"\"\n\n")
         elif class_info['inferred_description']:
-            doc += f"    # {class_info['inferred_description']}\n\n"
+            parts.append(f"    # {class_info['inferred_description']}\n\n")
         
         for var in class_info['class_variables']:
-            doc += f"    {var}\n"
+            parts.append(f"    {var}\n")
         
         for method_name, method_info in class_info['methods'].items():
-            doc += generate_function_doc(method_name, method_info, indentation=4)
+            parts.append(generate_function_doc(method_name, method_info, indentation=4))
         
-        doc += "\n"
-    return doc
+        parts.append("\n")
+    return ''.join(parts)
 
 def generate_functions_doc(functions):
-    doc = ""
-    for func_name, func_info in functions.items():
-        doc += generate_function_doc(func_name, func_info)
-    return doc
+    return ''.join(generate_function_doc(func_name, func_info) for func_name, func_info in functions.items())
 
 def generate_function_doc(func_name, func_info, indentation=0):
     indent = " " * indentation
-    doc = f"{indent}def {func_name}("
     args = []
     for arg in func_info['args']:
         arg_str = arg['name']
         if 'annotation' in arg:
             arg_str += f": {arg['annotation']}"
         args.append(arg_str)
-    doc += ", ".join(args)
-    doc += ")"
+    parts = [f"{indent}def {func_name}(", ", ".join(args), ")"]
     if func_info['returns']:
-        doc += f" -> {func_info['returns']}"
-    doc += ":\n"
+        parts.append(f" -> {func_info['returns']}")
+    parts.append(":\n")
     if func_info['docstring']:
-        doc += f"{indent}    \"\"\"{func_info['docstring']}\"\"\"\n"
+        parts.append(f"{indent}    \"\"\"{func_info['docstring']}\"\"\"\n")
     elif func_info['inferred_description']:
-        doc += f"{indent}    # {func_info['inferred_description']}\n"
-    doc += "\n"
-    return doc
+        parts.append(f"{indent}    # {func_info['inferred_description']}\n")
+    parts.append("\n")
+    return ''.join(parts)
 
 def generate_global_variables_doc(global_variables):
     return "\n".join([f"{var}" for var in global_variables])
\ No newline at end of file
@@ -4,12 +4,13 @@ from typing import List, Dict, Union
 MAX_ITEMS = 100
 
 def generate_random_list(length: int) -> List[int]:
-    return [random.randint(1, 100) for _ in range(length)]
+    return random.choices(range(1, 101), k=length)
 
 def process_data(data: List[int]) -> Dict[str, Union[int, float]]:
     result = {}
-    result['sum'] = sum(data)
-    result['average'] = sum(data) / len(data) if data else 0
+    total = sum(data)
+    result['sum'] = total
+    result['average'] = total / len(data) if data else 0
     result['max'] = max(data) if data else None
     result['min'] = min(data) if data else None
     return result
@@ -1,3 +1,4 @@
 from autodoc import autodoc
 
-autodoc('new_test_module.py', 'docs_output')
\ No newline at end of file
+if __name__ == '__main__':
+    autodoc('new_test_module.py', 'docs_output')
\ No newline at end of file